@@ -1,15 +1,24 @@
 from fastapi import FastAPI, UploadFile, File, Form, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from pydantic import BaseModel, field_validator
-from typing import Optional
-from datetime import datetime
-import random
+from fastapi.responses import FileResponse, JSONResponse
+from starlette.background import BackgroundTask
+from starlette.concurrency import run_in_threadpool
+from openpyxl import Workbook
+from pydantic import ConfigDict, Field, StringConstraints, TypeAdapter, ValidationError, with_config
+from typing import Annotated, Any, Iterator, Optional
+from typing_extensions import TypedDict
+from contextlib import asynccontextmanager
+from datetime import date, datetime
+import asyncio
 import os
-import json
+import orjson
+import aiofiles
 import logging
-import yaml
+import tempfile
+import threading
+import tomllib
 from pathlib import Path
+from types import SimpleNamespace
 import time
 
 # Import our custom logger
@@ -24,15 +33,94 @@ app_logger = get_logger()
 
 # Load configuration
 def load_config():
-    config_path = Path(__file__).parent / "config.yaml"
-    with open(config_path, 'r', encoding='utf-8') as f:
-        config = yaml.safe_load(f)
+    config_path = Path(__file__).parent / "config.toml"
+    with open(config_path, 'rb') as f:
+        config = tomllib.load(f)
     return config
 
+# Transport settings used when missing from config.toml
+TRANSPORT_DEFAULTS = {
+    'local_attachments_folder': './attachments',
+    'local_excel_file': './data/transport_requests.xlsx',
+    'sharepoint_attachments_folder': '/Shared Documents/Attachments',
+    'sharepoint_excel_path': '/Shared Documents/transport_requests.xlsx',
+}
+
 config = load_config()
-transport_config = config.get('default', {}).get('transport', {})
+transport_config = SimpleNamespace(
+    **{**TRANSPORT_DEFAULTS, **config.get('default', {}).get('transport', {})}
+)
+
+# Local storage paths (relative to backend folder), resolved once at startup
+BACKEND_DIR = Path(__file__).parent
+ATTACHMENTS_DIR = (BACKEND_DIR / transport_config.local_attachments_folder.lstrip('./')).resolve()
+EXCEL_PATH = (BACKEND_DIR / transport_config.local_excel_file.lstrip('./')).resolve()
+EXCEL_DIR = EXCEL_PATH.parent
+REQUESTS_JSONL_PATH = EXCEL_PATH.with_suffix('.jsonl')
+# JSON array store used before JSON Lines, migrated once at startup
+LEGACY_JSON_PATH = EXCEL_PATH.with_suffix('.json')
+ATTACHMENTS_DIR.mkdir(parents=True, exist_ok=True)
+EXCEL_DIR.mkdir(parents=True, exist_ok=True)
+
+# SharePoint targets (TODO: upload)
+SHAREPOINT_ATTACH = transport_config.sharepoint_attachments_folder
+SHAREPOINT_EXCEL = transport_config.sharepoint_excel_path
+
+# Uploads are copied to disk in chunks of this size (1 MiB)
+UPLOAD_CHUNK_SIZE = 1 << 20
+
+# Most requests accepted in a single /api/submit/batch call
+MAX_BATCH_SIZE = 100
+
+# Column order of the transport requests Excel export
+EXCEL_COLUMNS = [
+    'Request_ID', 'Timestamp', 'Delivery_Note_Number',
+    'Truck_License_Plates', 'Trailer_License_Plates',
+    'Carrier_Country', 'Carrier_Tax_Code', 'Carrier_Full_Name',
+    'Border_Crossing', 'Border_Crossing_Date', 'Has_Attachment'
+]
+
+# Open append-only descriptors, keyed by file path (see append_line)
+_append_fds: dict[Path, int] = {}
+_append_fds_lock = threading.Lock()
+
+# Saved requests keyed by Request_ID, for lookups without rescanning the JSONL file
+_saved_requests: dict[str, dict] = {}
 
-app = FastAPI(title="Transport Request API", version="1.0.0")
+# Timestamp of the last issued request ID (see _new_request_id)
+_last_request_ns = 0
+_request_id_lock = threading.Lock()
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson instead of the stdlib encoder"""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    migrate_legacy_json(LEGACY_JSON_PATH, REQUESTS_JSONL_PATH)
+    
+    # Index requests saved by earlier runs so lookups never touch the file
+    for row in iter_saved_requests(REQUESTS_JSONL_PATH):
+        request_id = row.get('Request_ID')
+        if not isinstance(request_id, str):
+            logger.warning("Not indexing saved request without a Request_ID: %s", row)
+            continue
+        _saved_requests[request_id] = row
+    
+    # Batch structured log writes in a background task while the app is running
+    app_logger.start()
+    yield
+    await app_logger.stop()
+    close_append_fds()
+
+app = FastAPI(
+    title="Transport Request API",
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
+)
 
 # CORS for local frontend dev
 app.add_middleware(
@@ -43,134 +131,141 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-class TransportRequest(BaseModel):
-    deliveryNoteNumber: str
-    truckLicensePlates: str
+# Required text field: surrounding whitespace is stripped, must not be empty
+NonEmptyStr = Annotated[str, StringConstraints(strip_whitespace=True, min_length=1)]
+
+@with_config(ConfigDict(str_strip_whitespace=True, extra='ignore'))
+class TransportRequest(TypedDict):
+    deliveryNoteNumber: NonEmptyStr
+    truckLicensePlates: NonEmptyStr
     trailerLicensePlates: str
-    carrierCountry: str
-    carrierTaxCode: str
-    carrierFullName: str
-    borderCrossing: str
-    borderCrossingDate: str  # ISO date string
-
-    @field_validator('deliveryNoteNumber', 'truckLicensePlates', 'carrierCountry', 'carrierTaxCode', 'carrierFullName', 'borderCrossing')
-    @classmethod
-    def validate_non_empty_string(cls, v):
-        if not v or v.strip() == "":
-            raise ValueError("Field cannot be empty")
-        return v.strip()
+    carrierCountry: NonEmptyStr
+    carrierTaxCode: NonEmptyStr
+    carrierFullName: NonEmptyStr
+    borderCrossing: NonEmptyStr
+    borderCrossingDate: date  # ISO date string (YYYY-MM-DD)
 
-@app.post("/api/submit")
-async def submit_transport_request(
-    request: Request,
-    data: str = Form(...),  # JSON as form field (not file!)
-    attachment: Optional[UploadFile] = File(None)
-):
-    """
-    Accepts JSON data (as form field) and optional file. Returns unique request ID.
-    """
-    start_time = time.time()
-    user_ip = request.client.host if request.client else "unknown"
-    
-    logger.info("=== NEW SUBMIT REQUEST ===")
-    logger.info(f"Received data: {data}")
-    logger.info(f"Attachment: {attachment.filename if attachment else 'None'}")
-    
-    # Generate unique request ID first for logging
-    now = datetime.now().strftime("%Y%m%d-%H%M%S")
-    rand = random.randint(100, 999)
-    request_id = f"REQ-{now}-{rand}"
+# Validator is built once; validation returns a plain dict, no model instance
+transport_request_validator = TypeAdapter(TransportRequest)
+
+class TransportRequestBatch(TypedDict):
+    requests: Annotated[list[TransportRequest], Field(min_length=1, max_length=MAX_BATCH_SIZE)]
+
+transport_request_batch_validator = TypeAdapter(TransportRequestBatch)
+
+def _reject_invalid_data(error: Exception, data: str, attachment: Optional[UploadFile], request_id: str, user_ip: str):
+    """Log a submission that failed validation and raise HTTP 400"""
+    logger.error("Data validation error: %s", error)
     
+    # Log validation error
     try:
-        # Parse JSON data
-        data_dict = json.loads(data)
-        logger.info(f"Parsed JSON: {data_dict}")
-        req = TransportRequest(**data_dict)
-        logger.info("Data validation successful")
-        logger.info(f"Generated request ID: {request_id}")
-        
-        # Log form submission attempt
-        app_logger.log_form_submit(
-            form_data=data_dict,
-            attachment_name=attachment.filename if attachment else None,
-            status="PROCESSING",
-            request_id=request_id,
-            user_ip=user_ip
-        )
+        parsed_data = orjson.loads(data)
+    except orjson.JSONDecodeError:
+        parsed_data = {"raw_data": data}
+    if not isinstance(parsed_data, dict):
+        parsed_data = {"raw_data": data}
         
-    except json.JSONDecodeError as e:
-        logger.error(f"JSON decode error: {e}")
+    app_logger.log_form_submit(
+        form_data=parsed_data,
+        attachment_name=attachment.filename if attachment else None,
+        status="ERROR",
+        error_message=f"Data validation error: {error}",
+        request_id=request_id,
+        user_ip=user_ip
+    )
+    
+    raise HTTPException(status_code=400, detail=f"Invalid data: {error}")
+
+def _new_request_id() -> str:
+    """Unique request ID: nanosecond timestamp plus 4 random hex digits.
+
+    The timestamp is forced to increase by at least 1 ns per ID, so IDs minted
+    in a tight loop stay unique within the process even where the clock is
+    coarse (e.g. ~15.6 ms ticks on Windows before Python 3.13).
+    """
+    global _last_request_ns
+    with _request_id_lock:
+        _last_request_ns = max(time.time_ns(), _last_request_ns + 1)
+        ns = _last_request_ns
+    return f"REQ-{ns}-{os.urandom(2).hex()}"
+
+def _validate_submission(validator: TypeAdapter, data: str, attachment: Optional[UploadFile], request_id: str, user_ip: str):
+    """Parse and validate the JSON form field in a single pass, raising HTTP 400 on failure"""
+    try:
+        return validator.validate_json(data)
         
-        # Log failed submission
-        app_logger.log_form_submit(
-            form_data={"raw_data": data},
-            status="ERROR",
-            error_message=f"JSON decode error: {e}",
-            request_id=request_id,
-            user_ip=user_ip
-        )
+    except ValidationError as e:
+        json_error = next((error for error in e.errors() if error['type'] == 'json_invalid'), None)
+        if json_error is not None:
+            logger.error("JSON decode error: %s", json_error['ctx']['error'])
+            
+            # Log failed submission
+            app_logger.log_form_submit(
+                form_data={"raw_data": data},
+                status="ERROR",
+                error_message=f"JSON decode error: {json_error['ctx']['error']}",
+                request_id=request_id,
+                user_ip=user_ip
+            )
+            
+            raise HTTPException(status_code=400, detail=f"Invalid JSON: {json_error['ctx']['error']}")
         
-        raise HTTPException(status_code=400, detail=f"Invalid JSON: {e}")
+        _reject_invalid_data(e, data, attachment, request_id, user_ip)
         
     except Exception as e:
-        logger.error(f"Data validation error: {e}")
-        
-        # Log validation error
-        try:
-            parsed_data = json.loads(data)
-        except:
-            parsed_data = {"raw_data": data}
-            
-        app_logger.log_form_submit(
-            form_data=parsed_data,
-            attachment_name=attachment.filename if attachment else None,
-            status="ERROR",
-            error_message=f"Data validation error: {e}",
-            request_id=request_id,
-            user_ip=user_ip
-        )
-        
-        raise HTTPException(status_code=400, detail=f"Invalid data: {e}")
+        _reject_invalid_data(e, data, attachment, request_id, user_ip)
 
+async def _save_submission(
+    request_id: str,
+    data_dict: dict,
+    attachment: Optional[UploadFile],
+    user_ip: str,
+    start_time: float
+) -> dict:
+    """Store one validated request (attachment + data row) and return its response body"""
+    # Log form submission attempt
+    app_logger.log_form_submit(
+        form_data=data_dict,
+        attachment_name=attachment.filename if attachment else None,
+        status="PROCESSING",
+        request_id=request_id,
+        user_ip=user_ip
+    )
+    
     # Save attachment with new name if exists
     attachment_saved = False
     if attachment and attachment.filename:
         ext = os.path.splitext(attachment.filename)[1]
         new_filename = f"attachment_{request_id}{ext}"
         
-        # Get attachments folder from config (relative to backend folder)
-        attachments_folder = transport_config.get('local_attachments_folder', './attachments')
-        backend_dir = Path(__file__).parent
-        attachments_path = backend_dir / attachments_folder.lstrip('./')
-        
-        # Create attachments directory if it doesn't exist
-        attachments_path.mkdir(exist_ok=True)
-        
-        # Save file locally
-        file_path = attachments_path / new_filename
-        content = await attachment.read()
-        with open(file_path, "wb") as f:
-            f.write(content)
+        # Save file locally, streaming in chunks so the upload is never fully buffered
+        file_path = ATTACHMENTS_DIR / new_filename
+        size = 0
+        async with aiofiles.open(file_path, "wb") as f:
+            while chunk := await attachment.read(UPLOAD_CHUNK_SIZE):
+                await f.write(chunk)
+                size += len(chunk)
+        await run_in_threadpool(drop_page_cache, file_path)
         attachment_saved = True
         
-        logger.info(f"Attachment saved: {file_path} ({len(content)} bytes)")
+        logger.info("Attachment saved: %s (%d bytes)", file_path, size)
         
         # TODO: Upload to SharePoint here
-        sharepoint_path = transport_config.get('sharepoint_attachments_folder', '/Shared Documents/Attachments')
-        logger.info(f"TODO: Upload to SharePoint: {sharepoint_path}/{new_filename}")
+        logger.info("TODO: Upload to SharePoint: %s/%s", SHAREPOINT_ATTACH, new_filename)
     else:
         logger.info("No attachment received")
 
     # Log received data summary
-    logger.info(f"Request processed successfully:")
-    logger.info(f"  - Request ID: {request_id}")
-    logger.info(f"  - Delivery Note: {data_dict.get('deliveryNoteNumber')}")
-    logger.info(f"  - Carrier: {data_dict.get('carrierFullName')}")
-    logger.info(f"  - Border Crossing: {data_dict.get('borderCrossing')}")
-    logger.info(f"  - Attachment: {'Yes' if attachment_saved else 'No'}")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Request processed successfully:")
+        logger.debug("  - Request ID: %s", request_id)
+        logger.debug("  - Delivery Note: %s", data_dict.get('deliveryNoteNumber'))
+        logger.debug("  - Carrier: %s", data_dict.get('carrierFullName'))
+        logger.debug("  - Border Crossing: %s", data_dict.get('borderCrossing'))
+        logger.debug("  - Attachment: %s", 'Yes' if attachment_saved else 'No')
     
     # Save data to Excel
-    excel_saved = save_to_excel(request_id, data_dict, attachment_saved)
+    excel_saved = await run_in_threadpool(save_to_excel, request_id, data_dict, attachment_saved)
     
     # Calculate processing time
     processing_time = int((time.time() - start_time) * 1000)  # milliseconds
@@ -184,7 +279,7 @@ async def submit_transport_request(
         user_ip=user_ip
     )
     
-    response_data = {
+    return {
         "success": True,
         "request_id": request_id,
         "attachment_saved": attachment_saved,
@@ -192,21 +287,72 @@ async def submit_transport_request(
         "processing_time_ms": processing_time,
         "data_received": data_dict
     }
+
+@app.post("/api/submit")
+async def submit_transport_request(
+    request: Request,
+    data: str = Form(...),  # JSON as form field (not file!)
+    attachment: Optional[UploadFile] = File(None)
+):
+    """
+    Accepts JSON data (as form field) and optional file. Returns unique request ID.
+    """
+    start_time = time.time()
+    user_ip = request.client.host if request.client else "unknown"
+    
+    logger.info("=== NEW SUBMIT REQUEST ===")
+    logger.info("Received data: %s", data)
+    logger.info("Attachment: %s", attachment.filename if attachment else 'None')
+    
+    # Generate unique request ID first for logging
+    request_id = _new_request_id()
+    
+    data_dict = _validate_submission(transport_request_validator, data, attachment, request_id, user_ip)
+    logger.info("Parsed JSON: %s", data_dict)
+    logger.info("Data validation successful")
+    logger.info("Generated request ID: %s", request_id)
+    
+    response_data = await _save_submission(request_id, data_dict, attachment, user_ip, start_time)
     
     logger.info("=== REQUEST COMPLETED ===")
-    return JSONResponse(response_data)
+    return ORJSONResponse(response_data)
+
+@app.post("/api/submit/batch")
+async def submit_transport_request_batch(
+    request: Request,
+    data: str = Form(...)  # JSON {"requests": [...]} as form field
+):
+    """
+    Accepts several requests (no attachments) in one call and stores them concurrently.
+    The whole batch is rejected if any request is invalid.
+    """
+    start_time = time.time()
+    user_ip = request.client.host if request.client else "unknown"
+    
+    logger.info("=== NEW BATCH SUBMIT REQUEST ===")
+    
+    # ID under which a rejected batch is logged
+    batch_id = _new_request_id()
+    
+    batch = _validate_submission(transport_request_batch_validator, data, None, batch_id, user_ip)
+    logger.info("Batch validation successful: %d requests", len(batch['requests']))
+    
+    results = await asyncio.gather(*(
+        _save_submission(_new_request_id(), data_dict, None, user_ip, start_time)
+        for data_dict in batch['requests']
+    ))
+    
+    logger.info("=== BATCH COMPLETED ===")
+    return ORJSONResponse({
+        "success": True,
+        "count": len(results),
+        "processing_time_ms": int((time.time() - start_time) * 1000),
+        "results": results
+    })
 
 def save_to_excel(request_id: str, data: dict, has_attachment: bool) -> bool:
     """Save transport request data to Excel file"""
     try:
-        # Get Excel file path from config
-        excel_file = transport_config.get('local_excel_file', './data/transport_requests.xlsx')
-        backend_dir = Path(__file__).parent
-        excel_path = backend_dir / excel_file.lstrip('./')
-        
-        # Create data directory if it doesn't exist
-        excel_path.parent.mkdir(exist_ok=True)
-        
         # Prepare row data
         row_data = {
             'Request_ID': request_id,
@@ -222,48 +368,199 @@ def save_to_excel(request_id: str, data: dict, has_attachment: bool) -> bool:
             'Has_Attachment': 'Yes' if has_attachment else 'No'
         }
         
-        logger.info(f"Saving to Excel: {excel_path}")
-        logger.info(f"Row data: {row_data}")
-        
-        # TODO: Implement Excel writing (openpyxl or pandas)
-        # For now, save as JSON
-        json_path = excel_path.with_suffix('.json')
-        
-        # Load existing data or create new
-        existing_data = []
-        if json_path.exists():
-            with open(json_path, 'r', encoding='utf-8') as f:
-                existing_data = json.load(f)
-        
-        # Add new row
-        existing_data.append(row_data)
+        logger.info("Saving to Excel: %s", EXCEL_PATH)
+        logger.info("Row data: %s", row_data)
         
-        # Save updated data
-        with open(json_path, 'w', encoding='utf-8') as f:
-            json.dump(existing_data, f, indent=2, ensure_ascii=False)
+        # Rows are appended as JSON Lines (one request per line);
+        # the Excel workbook is built from them on demand (see export_to_excel)
+        append_line(REQUESTS_JSONL_PATH, orjson.dumps(row_data) + b'\n')
+        _saved_requests[request_id] = row_data
         
-        logger.info(f"Data saved to: {json_path}")
+        logger.info("Data saved to: %s", REQUESTS_JSONL_PATH)
         
         # TODO: Upload to SharePoint Excel
-        sharepoint_excel = transport_config.get('sharepoint_excel_path', '/Shared Documents/transport_requests.xlsx')
-        logger.info(f"TODO: Upload to SharePoint Excel: {sharepoint_excel}")
+        logger.info("TODO: Upload to SharePoint Excel: %s", SHAREPOINT_EXCEL)
         
         return True
         
     except Exception as e:
-        logger.error(f"Error saving to Excel: {e}")
+        logger.error("Error saving to Excel: %s", e)
+        return False
+
+def drop_page_cache(path: Path) -> None:
+    """Advise the kernel that a closed file won't be read again (no-op off Linux).
+
+    Linux does not drop dirty pages, so for a file that was just written this
+    only starts writeback early; once written back the pages are clean and cheap
+    to reclaim, instead of crowding out hotter data.
+    """
+    if not hasattr(os, 'posix_fadvise'):
+        return
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+    finally:
+        os.close(fd)
+
+def append_line(path: Path, line: bytes) -> None:
+    """Append one line to a file through a long-lived O_APPEND descriptor.
+
+    The descriptor is opened once per path and reused, so every append is a
+    single write() call without the open/close round trip.
+    """
+    fd = _append_fds.get(path)
+    if fd is None:
+        # Saves run in the threadpool: only one thread may open the descriptor
+        with _append_fds_lock:
+            fd = _append_fds.get(path)
+            if fd is None:
+                # Terminate a partial last line (interrupted append) so it cannot
+                # swallow the first new record
+                if _ends_mid_line(path):
+                    line = b'\n' + line
+                flags = os.O_WRONLY | os.O_CREAT | os.O_APPEND | getattr(os, 'O_BINARY', 0)
+                fd = _append_fds[path] = os.open(path, flags, 0o644)
+    os.write(fd, line)
+
+def close_append_fds() -> None:
+    """Close all descriptors opened by append_line (called on shutdown)"""
+    with _append_fds_lock:
+        while _append_fds:
+            _, fd = _append_fds.popitem()
+            os.close(fd)
+
+def _ends_mid_line(path: Path) -> bool:
+    """True when the file exists, is not empty and does not end with a newline"""
+    try:
+        with open(path, 'rb') as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) != b'\n'
+    except (FileNotFoundError, OSError):
         return False
 
+def migrate_legacy_json(legacy_path: Path, json_path: Path) -> int:
+    """Move requests from the old JSON array file into the JSON Lines file.
+
+    Legacy rows are written before any rows already in the JSON Lines file,
+    the result replaces it atomically and the legacy file is renamed to
+    *.json.migrated so the migration runs only once. Returns the number of
+    migrated rows.
+    """
+    if not legacy_path.exists():
+        return 0
+    
+    try:
+        legacy_rows = orjson.loads(legacy_path.read_bytes())
+    except orjson.JSONDecodeError as e:
+        logger.error("Cannot migrate %s, file is not valid JSON: %s", legacy_path, e)
+        return 0
+    if not isinstance(legacy_rows, list):
+        logger.error("Cannot migrate %s, expected a JSON array", legacy_path)
+        return 0
+    
+    # The file is about to be replaced, drop any descriptor still pointing at it
+    fd = _append_fds.pop(json_path, None)
+    if fd is not None:
+        os.close(fd)
+    
+    tmp_path = json_path.with_name(json_path.name + '.tmp')
+    with open(tmp_path, 'wb') as f:
+        for row in legacy_rows:
+            f.write(orjson.dumps(row) + b'\n')
+        if json_path.exists():
+            current = json_path.read_bytes()
+            if current and not current.endswith(b'\n'):
+                current += b'\n'
+            f.write(current)
+    os.replace(tmp_path, json_path)
+    legacy_path.rename(legacy_path.with_name(legacy_path.name + '.migrated'))
+    
+    logger.info("Migrated %d requests from %s to %s", len(legacy_rows), legacy_path, json_path)
+    return len(legacy_rows)
+
+def iter_saved_requests(json_path: Path) -> Iterator[dict]:
+    """Stream saved transport requests from the JSON Lines file, one row at a time.
+
+    Lines that cannot be parsed (e.g. a partial line left by an interrupted
+    append or a full disk) or that are not JSON objects are logged and skipped.
+    """
+    if not json_path.exists():
+        return
+    with open(json_path, 'rb') as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                row = orjson.loads(line)
+            except orjson.JSONDecodeError as e:
+                logger.warning("Skipping unreadable line %d in %s: %s", line_number, json_path, e)
+                continue
+            if not isinstance(row, dict):
+                logger.warning("Skipping line %d in %s: not a JSON object", line_number, json_path)
+                continue
+            yield row
+
+def export_to_excel(json_path: Path, excel_path: Path) -> int:
+    """Write all saved requests to an Excel file, returns the number of rows.
+
+    Uses openpyxl write-only mode so rows are streamed into the workbook
+    and memory stays constant regardless of history size.
+    """
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Transport Requests")
+    ws.append(EXCEL_COLUMNS)
+    
+    rows = 0
+    for row in iter_saved_requests(json_path):
+        ws.append([row.get(column, '') for column in EXCEL_COLUMNS])
+        rows += 1
+    
+    wb.save(excel_path)
+    return rows
+
 @app.get("/")
-def root():
+async def root():
     logger.info("Health check endpoint accessed")
     return {"message": "Transport backend running", "status": "healthy"}
 
 @app.get("/api/health")
-def health():
+async def health():
     logger.info("API health check accessed")
     return {"status": "healthy", "service": "transport-api"}
 
+@app.get("/api/requests/{request_id}")
+async def get_saved_request(request_id: str):
+    """Return one saved request by its ID"""
+    row = _saved_requests.get(request_id)
+    if row is None:
+        raise HTTPException(status_code=404, detail=f"Request not found: {request_id}")
+    return row
+
+@app.get("/api/export")
+def export_excel():
+    """Build the Excel file from all saved requests and return it for download.
+
+    Every export writes its own temporary workbook in EXCEL_DIR, removed once
+    the response is sent, so concurrent exports and downloads in progress
+    never see a partially written file.
+    """
+    fd, tmp_name = tempfile.mkstemp(prefix=f"{EXCEL_PATH.stem}_", suffix=EXCEL_PATH.suffix, dir=EXCEL_DIR)
+    os.close(fd)
+    tmp_path = Path(tmp_name)
+    try:
+        rows = export_to_excel(REQUESTS_JSONL_PATH, tmp_path)
+    except Exception:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    logger.info("Excel export created: %s (%d rows)", tmp_path, rows)
+    
+    return FileResponse(
+        tmp_path,
+        filename=EXCEL_PATH.name,
+        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        background=BackgroundTask(tmp_path.unlink, missing_ok=True)
+    )
+
 if __name__ == "__main__":
     import uvicorn
     logger.info("Starting FastAPI server...")
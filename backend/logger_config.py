@@ -4,15 +4,41 @@ Provides structured logging with JSON format and CSV export capabilities
 """
 
 import logging
-import json
+import asyncio
+import orjson
 import csv
 import os
+import time
+import atexit
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
 import traceback
 
 
+# CSV headers for form submission logs
+CSV_HEADERS = [
+    'timestamp', 'event_type', 'request_id', 'user_ip', 'status',
+    'delivery_note', 'truck_plates', 'trailer_plates', 
+    'carrier_country', 'carrier_name', 'border_crossing', 'crossing_date',
+    'has_attachment', 'attachment_filename', 'error_message'
+]
+
+# Logged form fields (log key -> form field), in CSV column order
+FORM_LOG_FIELDS = {
+    'delivery_note': 'deliveryNoteNumber',
+    'truck_plates': 'truckLicensePlates',
+    'trailer_plates': 'trailerLicensePlates',
+    'carrier_country': 'carrierCountry',
+    'carrier_name': 'carrierFullName',
+    'border_crossing': 'borderCrossing',
+    'crossing_date': 'borderCrossingDate'
+}
+
+# Background writer: max entries per batch and how long to gather them (seconds)
+LOG_BATCH_SIZE = 64
+LOG_BATCH_INTERVAL = 0.01
+
 class StructuredLogger:
     """Advanced logger with JSON and CSV output capabilities"""
     
@@ -23,54 +49,137 @@ class StructuredLogger:
         self.app_name = app_name
         self.log_dir.mkdir(exist_ok=True)
         
-        # Setup structured logger
+        # Standard logger is only used for console output
         self.logger = logging.getLogger(app_name)
         self.logger.setLevel(logging.INFO)
         
         # Remove existing handlers to avoid duplicates
         self.logger.handlers.clear()
         
-        # Setup file handlers
-        self._setup_file_handlers()
+        # Cached date string and date/time prefix (see _today and _timestamp)
+        self._day_str = None
+        self._day_end = 0.0
+        self._ts_second = None
+        self._ts_iso = None
         
-    def _setup_file_handlers(self):
-        """Setup file handlers for different log formats"""
-        today = datetime.now().strftime("%Y%m%d")
+        # Setup console and file outputs
+        self._setup_console_handler()
+        self._open_jsonl_log()
         
-        # JSON log handler
-        json_handler = logging.FileHandler(
-            self.log_dir / f"{self.app_name}_{today}.jsonl"
-        )
-        json_handler.setFormatter(self._get_json_formatter())
-        self.logger.addHandler(json_handler)
+        # CSV file is kept open and only reopened when the day changes
+        self._csv_day = None
+        self._csv_fh = None
+        self._csv_writer = None
+        atexit.register(self.close)
         
-        # Console handler for development
+        # Queue drained by the background writer (see start/stop)
+        self._queue = None
+        self._drain_task = None
+        
+    def _setup_console_handler(self):
+        """Setup console handler for development"""
         console_handler = logging.StreamHandler()
         console_handler.setFormatter(
             logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
         )
         self.logger.addHandler(console_handler)
+    
+    def _open_jsonl_log(self):
+        """Open the JSON Lines log file, entries are written to it directly"""
+        today = self._today()
+        self._jsonl_fh = open(
+            self.log_dir / f"{self.app_name}_{today}.jsonl", "ab", buffering=1 << 16
+        )
+    
+    def _today(self) -> str:
+        """Current local date as YYYYMMDD, formatted only once per day"""
+        now = time.time()
+        if now >= self._day_end:
+            local = time.localtime(now)
+            self._day_str = time.strftime("%Y%m%d", local)
+            # Next local midnight, mktime normalizes day overflow and DST
+            self._day_end = time.mktime(
+                (local.tm_year, local.tm_mon, local.tm_mday + 1, 0, 0, 0, 0, 0, -1)
+            )
+        return self._day_str
+    
+    def _timestamp(self) -> str:
+        """Current time in ISO format, date/time part is formatted once per second"""
+        now = time.time()
+        second = int(now)
+        if second != self._ts_second:
+            self._ts_second = second
+            self._ts_iso = datetime.fromtimestamp(second).isoformat()
+        return f"{self._ts_iso}.{int((now - second) * 1e6):06d}"
+    
+    def _jsonl_line(self, level: str, message: str, data: Dict[str, Any], timestamp: Optional[str] = None) -> bytes:
+        """Serialize one entry for the JSON Lines log file"""
+        log_entry = {
+            'timestamp': timestamp or self._timestamp(),
+            'level': level,
+            'message': message,
+            **data
+        }
+        return orjson.dumps(log_entry, default=str) + b"\n"
+    
+    def _emit(self, jsonl_line: bytes, csv_row: Optional[tuple] = None):
+        """Queue an entry for the background writer, or write it right away when it is not running"""
+        if self._queue is not None:
+            self._queue.put_nowait((jsonl_line, csv_row))
+        else:
+            self._write_batch([(jsonl_line, csv_row)])
+    
+    def _write_batch(self, entries: List[Tuple[bytes, Optional[tuple]]]):
+        """Write a batch of entries with one JSON Lines write and one CSV writerows"""
+        self._jsonl_fh.write(b"".join(line for line, _ in entries))
         
-    def _get_json_formatter(self):
-        """Custom JSON formatter"""
-        class JSONFormatter(logging.Formatter):
-            def format(self, record):
-                log_entry = {
-                    'timestamp': datetime.fromtimestamp(record.created).isoformat(),
-                    'level': record.levelname,
-                    'message': record.getMessage(),
-                    'module': record.module,
-                    'function': record.funcName,
-                    'line': record.lineno
-                }
-                
-                # Add extra fields if present
-                if hasattr(record, 'extra_data'):
-                    log_entry.update(record.extra_data)
-                    
-                return json.dumps(log_entry, ensure_ascii=False)
-                
-        return JSONFormatter()
+        csv_rows = [row for _, row in entries if row is not None]
+        if csv_rows:
+            today = self._today()
+            if today != self._csv_day:
+                self._open_csv_log(today)
+            self._csv_writer.writerows(csv_rows)
+    
+    def start(self):
+        """Start the background writer, must be called from the running event loop"""
+        if self._drain_task is None:
+            self._queue = asyncio.Queue()
+            self._drain_task = asyncio.create_task(self._drain())
+    
+    async def stop(self):
+        """Write all queued entries and stop the background writer"""
+        if self._drain_task is None:
+            return
+        self._queue.put_nowait(None)
+        await self._drain_task
+        self._queue = None
+        self._drain_task = None
+    
+    async def _drain(self):
+        """Write queued entries in batches until stop() queues None"""
+        while True:
+            batch = [await self._queue.get()]
+            # Give concurrent requests a moment to add their entries to the batch
+            await asyncio.sleep(LOG_BATCH_INTERVAL)
+            while len(batch) < LOG_BATCH_SIZE:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+            
+            entries = [entry for entry in batch if entry is not None]
+            if entries:
+                # A failed write (e.g. disk full) drops this batch but must not
+                # stop the writer, otherwise every later entry piles up in the queue
+                try:
+                    self._write_batch(entries)
+                    self._jsonl_fh.flush()
+                    if self._csv_fh is not None:
+                        self._csv_fh.flush()
+                except Exception:
+                    self.logger.exception("Failed to write %d log entries", len(entries))
+            if len(entries) < len(batch):
+                return
     
     def log_form_submit(
         self, 
@@ -83,21 +192,17 @@ class StructuredLogger:
     ):
         """Log form submission with structured data"""
         
+        timestamp = self._timestamp()
+        form_values = tuple(form_data.get(field, '') for field in FORM_LOG_FIELDS.values())
+        has_attachment = attachment_name is not None
+        
         log_data = {
             'event_type': 'FORM_SUBMIT',
             'request_id': request_id,
             'user_ip': user_ip,
-            'form_data': {
-                'delivery_note': form_data.get('deliveryNoteNumber', ''),
-                'truck_plates': form_data.get('truckLicensePlates', ''),
-                'trailer_plates': form_data.get('trailerLicensePlates', ''),
-                'carrier_country': form_data.get('carrierCountry', ''),
-                'carrier_name': form_data.get('carrierFullName', ''),
-                'border_crossing': form_data.get('borderCrossing', ''),
-                'crossing_date': form_data.get('borderCrossingDate', '')
-            },
+            'form_data': dict(zip(FORM_LOG_FIELDS, form_values)),
             'attachment': {
-                'has_attachment': attachment_name is not None,
+                'has_attachment': has_attachment,
                 'filename': attachment_name,
                 'size_bytes': getattr(form_data, 'attachment_size', None)
             },
@@ -106,64 +211,49 @@ class StructuredLogger:
             'processing_time_ms': getattr(form_data, 'processing_time', None)
         }
         
-        # Create log record with extra data
-        record = logging.LogRecord(
-            name=self.logger.name,
-            level=logging.ERROR if status == "ERROR" else logging.INFO,
-            pathname="",
-            lineno=0,
-            msg=f"Form submission {status}: {request_id}",
-            args=(),
-            exc_info=None
-        )
-        record.extra_data = log_data
+        message = f"Form submission {status}: {request_id}"
+        level = "ERROR" if status == "ERROR" else "INFO"
         
-        self.logger.handle(record)
+        # Also write to CSV for easy analysis (row in CSV_HEADERS order)
+        csv_row = (
+            timestamp, 'FORM_SUBMIT', request_id, user_ip, status,
+            *form_values,
+            has_attachment, attachment_name, error_message
+        )
+        self._emit(self._jsonl_line(level, message, log_data, timestamp), csv_row)
         
-        # Also write to CSV for easy analysis
-        self._write_csv_log(log_data)
+        if status == "ERROR":
+            self.logger.error(message)
     
-    def _write_csv_log(self, log_data: Dict[str, Any]):
-        """Write log entry to CSV file for easy analysis"""
-        today = datetime.now().strftime("%Y%m%d")
+    def _open_csv_log(self, today: str):
+        """Open (or rotate to) the CSV log file for the given day"""
+        self._close_csv_log()
         csv_file = self.log_dir / f"form_submissions_{today}.csv"
         
-        # CSV headers
-        headers = [
-            'timestamp', 'event_type', 'request_id', 'user_ip', 'status',
-            'delivery_note', 'truck_plates', 'trailer_plates', 
-            'carrier_country', 'carrier_name', 'border_crossing', 'crossing_date',
-            'has_attachment', 'attachment_filename', 'error_message'
-        ]
-        
         # Check if file exists to determine if we need headers
         file_exists = csv_file.exists()
         
-        with open(csv_file, 'a', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            
-            # Write headers if file is new
-            if not file_exists:
-                writer.writerow(headers)
-            
-            # Write data row
-            writer.writerow([
-                datetime.now().isoformat(),
-                log_data['event_type'],
-                log_data['request_id'],
-                log_data['user_ip'],
-                log_data['status'],
-                log_data['form_data']['delivery_note'],
-                log_data['form_data']['truck_plates'],
-                log_data['form_data']['trailer_plates'],
-                log_data['form_data']['carrier_country'],
-                log_data['form_data']['carrier_name'],
-                log_data['form_data']['border_crossing'],
-                log_data['form_data']['crossing_date'],
-                log_data['attachment']['has_attachment'],
-                log_data['attachment']['filename'],
-                log_data['error_message']
-            ])
+        self._csv_fh = open(csv_file, 'a', newline='', encoding='utf-8', buffering=1 << 16)
+        self._csv_writer = csv.writer(self._csv_fh, dialect='unix')
+        self._csv_day = today
+        
+        # Write headers if file is new
+        if not file_exists:
+            self._csv_writer.writerow(CSV_HEADERS)
+    
+    def _close_csv_log(self):
+        """Close the currently open CSV log file, if any"""
+        if self._csv_fh is not None:
+            self._csv_fh.close()
+        self._csv_fh = None
+        self._csv_writer = None
+        self._csv_day = None
+    
+    def close(self):
+        """Flush and close the log files (called on shutdown)"""
+        self._close_csv_log()
+        if not self._jsonl_fh.closed:
+            self._jsonl_fh.close()
     
     def log_error(self, error: Exception, context: Dict[str, Any] = None):
         """Log error with full context"""
@@ -175,18 +265,9 @@ class StructuredLogger:
             'context': context or {}
         }
         
-        record = logging.LogRecord(
-            name=self.logger.name,
-            level=logging.ERROR,
-            pathname="",
-            lineno=0,
-            msg=f"Error occurred: {str(error)}",
-            args=(),
-            exc_info=None
-        )
-        record.extra_data = error_data
-        
-        self.logger.handle(record)
+        message = f"Error occurred: {str(error)}"
+        self._emit(self._jsonl_line("ERROR", message, error_data))
+        self.logger.error(message)
     
     def log_info(self, message: str, extra_data: Dict[str, Any] = None):
         """Log general information"""
@@ -195,18 +276,7 @@ class StructuredLogger:
             'extra_data': extra_data or {}
         }
         
-        record = logging.LogRecord(
-            name=self.logger.name,
-            level=logging.INFO,
-            pathname="",
-            lineno=0,
-            msg=message,
-            args=(),
-            exc_info=None
-        )
-        record.extra_data = log_data
-        
-        self.logger.handle(record)
+        self._emit(self._jsonl_line("INFO", message, log_data))
 
 
 # Global logger instance
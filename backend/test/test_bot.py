@@ -1,18 +1,18 @@
 import pytest
 import os
 import sys
+import subprocess
 from pathlib import Path
 from freezegun import freeze_time
 from main import Task
 from rpa_bot.log import lte, log
-from rpa_bot.utils import task_kill
 # # For debug console issue while launching GUI apps
 # import faulthandler 
 # faulthandler.disable()
 
 pytest.bot = None
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def bot():
     pytest.bot = Task(sysargs=['bot_mode=dev', 'log_debug=True'])
     return pytest.bot
@@ -30,4 +30,12 @@ def test_expected_error(bot: Task):
 
 def test_clear():
     """Ending of test - close all windows opened by prevoius tests"""
-    task_kill("excel.exe")
+    if sys.platform != "win32":
+        return
+    try:
+        subprocess.run(
+            ["taskkill", "/F", "/IM", "excel.exe"],
+            timeout=0.5, capture_output=True, check=False
+        )
+    except subprocess.TimeoutExpired:
+        pass
@@ -6,18 +6,30 @@ Run tests with:
 """
 
 import pytest
+import asyncio
 import json
 import tempfile
 import os
+from datetime import date
 from pathlib import Path
-from unittest.mock import patch, mock_open, MagicMock
+from unittest.mock import patch, mock_open, MagicMock, AsyncMock
 from fastapi.testclient import TestClient
 from io import BytesIO
 
 # Import the FastAPI app
 import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from fastapi_app import app, load_config, save_to_excel, TransportRequest
+from logger_config import StructuredLogger
+import fastapi_app
+from fastapi_app import app, load_config, transport_config, save_to_excel, append_line, close_append_fds, iter_saved_requests, migrate_legacy_json, export_to_excel, EXCEL_COLUMNS, transport_request_validator
+
+
+@pytest.fixture(autouse=True)
+def isolated_data_store(tmp_path):
+    """Keep every test (and the lifespan's legacy migration) away from backend/data"""
+    with patch('fastapi_app.REQUESTS_JSONL_PATH', tmp_path / "transport_requests.jsonl"), \
+         patch('fastapi_app.LEGACY_JSON_PATH', tmp_path / "transport_requests.json"):
+        yield
 
 
 @pytest.fixture
@@ -41,6 +53,19 @@ def sample_form_data():
     }
 
 
+@pytest.fixture
+def mock_aiofiles_open():
+    """Patch aiofiles.open so attachment writes stay in memory"""
+    mock_file = MagicMock()
+    mock_file.write = AsyncMock()
+    mock_open_ctx = MagicMock()
+    mock_open_ctx.return_value.__aenter__ = AsyncMock(return_value=mock_file)
+    mock_open_ctx.return_value.__aexit__ = AsyncMock(return_value=False)
+    with patch('fastapi_app.aiofiles.open', mock_open_ctx), \
+         patch('fastapi_app.drop_page_cache'):
+        yield mock_open_ctx, mock_file
+
+
 @pytest.fixture
 def sample_file():
     """Create a sample file for testing uploads"""
@@ -68,61 +93,78 @@ class TestHealthEndpoints:
 
 
 class TestTransportRequestModel:
-    """Test the Pydantic model validation"""
+    """Test the transport request validation"""
     
     def test_valid_transport_request(self, sample_form_data):
-        """Test valid transport request model creation"""
-        request = TransportRequest(**sample_form_data)
-        assert request.deliveryNoteNumber == "DN123456"
-        assert request.carrierCountry == "Poland"
+        """Test valid transport request validation"""
+        request = transport_request_validator.validate_python(sample_form_data)
+        assert request["deliveryNoteNumber"] == "DN123456"
+        assert request["carrierCountry"] == "Poland"
     
     def test_missing_required_field(self):
         """Test validation fails with missing required field"""
         with pytest.raises(ValueError):
-            TransportRequest(
-                truckLicensePlates="AB123CD",
+            transport_request_validator.validate_python({
+                "truckLicensePlates": "AB123CD",
                 # Missing deliveryNoteNumber
-            )
+            })
     
     def test_empty_string_validation(self):
         """Test validation with empty strings"""
         with pytest.raises(ValueError):
-            TransportRequest(
-                deliveryNoteNumber="",  # Empty string
-                truckLicensePlates="AB123CD",
-                trailerLicensePlates="EF456GH",
-                carrierCountry="Poland",
-                carrierTaxCode="PL1234567890",
-                carrierFullName="Test Company",
-                borderCrossing="Nadlac",
-                borderCrossingDate="2025-10-25"
-            )
+            transport_request_validator.validate_python({
+                "deliveryNoteNumber": "",  # Empty string
+                "truckLicensePlates": "AB123CD",
+                "trailerLicensePlates": "EF456GH",
+                "carrierCountry": "Poland",
+                "carrierTaxCode": "PL1234567890",
+                "carrierFullName": "Test Company",
+                "borderCrossing": "Nadlac",
+                "borderCrossingDate": "2025-10-25"
+            })
+    
+    def test_whitespace_only_validation(self, sample_form_data):
+        """Test validation rejects whitespace-only required fields"""
+        sample_form_data["carrierFullName"] = "   "
+        with pytest.raises(ValueError):
+            transport_request_validator.validate_python(sample_form_data)
+    
+    def test_fields_are_stripped_and_date_parsed(self, sample_form_data):
+        """Test string fields are stripped and the crossing date is parsed"""
+        sample_form_data["deliveryNoteNumber"] = "  DN123456  "
+        sample_form_data["unknownField"] = "ignored"
+        request = transport_request_validator.validate_json(json.dumps(sample_form_data))
+        assert isinstance(request, dict)
+        assert request["deliveryNoteNumber"] == "DN123456"
+        assert request["borderCrossingDate"] == date(2025, 10, 25)
+        assert "unknownField" not in request
+    
+    def test_invalid_date_validation(self, sample_form_data):
+        """Test validation fails with a malformed crossing date"""
+        sample_form_data["borderCrossingDate"] = "25/10/2025"
+        with pytest.raises(ValueError):
+            transport_request_validator.validate_python(sample_form_data)
 
 
 class TestConfigurationLoading:
-    """Test configuration loading from YAML"""
+    """Test configuration loading from TOML"""
     
-    @patch("builtins.open", mock_open(read_data="""
-default:
-  transport:
-    local_attachments_folder: "./test_attachments"
-    local_excel_file: "./test_data/requests.xlsx"
+    @patch("builtins.open", mock_open(read_data=b"""
+[default.transport]
+local_attachments_folder = "./test_attachments"
+local_excel_file = "./test_data/requests.xlsx"
 """))
-    @patch("yaml.safe_load")
-    def test_load_config(self, mock_yaml_load):
+    def test_load_config(self):
         """Test configuration loading"""
-        mock_yaml_load.return_value = {
-            "default": {
-                "transport": {
-                    "local_attachments_folder": "./test_attachments",
-                    "local_excel_file": "./test_data/requests.xlsx"
-                }
-            }
-        }
-        
         config = load_config()
         assert "default" in config
         assert "transport" in config["default"]
+        assert config["default"]["transport"]["local_attachments_folder"] == "./test_attachments"
+    
+    def test_transport_config_defaults(self):
+        """Test transport settings are exposed as attributes with defaults"""
+        assert transport_config.local_attachments_folder
+        assert transport_config.sharepoint_excel_path.endswith(".xlsx")
 
 
 class TestSubmitEndpoint:
@@ -144,12 +186,12 @@ class TestSubmitEndpoint:
         assert data["attachment_saved"] is False
         assert data["excel_saved"] is True
     
-    def test_submit_valid_request_with_file(self, client, sample_form_data):
+    def test_submit_valid_request_with_file(self, client, sample_form_data, mock_aiofiles_open):
         """Test submitting valid request with file attachment"""
         file_content = b"Test PDF content"
+        mock_open_ctx, mock_file = mock_aiofiles_open
         
         with patch('fastapi_app.save_to_excel', return_value=True), \
-             patch('builtins.open', mock_open()) as mock_file, \
              patch('os.makedirs'), \
              patch('pathlib.Path.mkdir'):
             
@@ -163,7 +205,24 @@ class TestSubmitEndpoint:
         data = response.json()
         assert data["success"] is True
         assert data["attachment_saved"] is True
-        mock_file.assert_called()
+        mock_open_ctx.assert_called_once()
+        written = b"".join(call.args[0] for call in mock_file.write.await_args_list)
+        assert written == file_content
+    
+    def test_submit_returns_validated_data(self, client, sample_form_data):
+        """Test the response echoes the validated (stripped) data"""
+        sample_form_data["carrierFullName"] = "  Test Transport Company  "
+        
+        with patch('fastapi_app.save_to_excel', return_value=True):
+            response = client.post(
+                "/api/submit",
+                data={"data": json.dumps(sample_form_data)}
+            )
+        
+        assert response.status_code == 200
+        data_received = response.json()["data_received"]
+        assert data_received["carrierFullName"] == "Test Transport Company"
+        assert data_received["borderCrossingDate"] == "2025-10-25"
     
     def test_submit_invalid_json(self, client):
         """Test submitting invalid JSON data"""
@@ -192,6 +251,16 @@ class TestSubmitEndpoint:
         data = response.json()
         assert "Invalid data" in data["detail"]
     
+    def test_submit_non_object_json(self, client):
+        """Test submitting valid JSON that is not an object"""
+        response = client.post(
+            "/api/submit",
+            data={"data": "[1, 2, 3]"}
+        )
+        
+        assert response.status_code == 400
+        assert "Invalid data" in response.json()["detail"]
+    
     def test_submit_empty_data(self, client):
         """Test submitting empty data"""
         response = client.post("/api/submit")
@@ -199,6 +268,62 @@ class TestSubmitEndpoint:
         assert response.status_code == 422  # Unprocessable Entity
 
 
+class TestBatchSubmitEndpoint:
+    """Test the batch submit endpoint"""
+    
+    def test_submit_batch(self, client, sample_form_data):
+        """Test every request in a batch is saved under its own ID"""
+        batch = {"requests": [sample_form_data, {**sample_form_data, "deliveryNoteNumber": "DN456"}]}
+        
+        with patch('fastapi_app.save_to_excel', return_value=True) as mock_save:
+            response = client.post(
+                "/api/submit/batch",
+                data={"data": json.dumps(batch)}
+            )
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["success"] is True
+        assert data["count"] == 2
+        assert [result["data_received"]["deliveryNoteNumber"] for result in data["results"]] == ["DN123456", "DN456"]
+        assert all(result["excel_saved"] for result in data["results"])
+        assert len({result["request_id"] for result in data["results"]}) == 2
+        assert mock_save.call_count == 2
+    
+    def test_submit_batch_rejects_invalid_request(self, client, sample_form_data):
+        """Test one invalid request rejects the whole batch"""
+        batch = {"requests": [sample_form_data, {"deliveryNoteNumber": "DN456"}]}
+        
+        with patch('fastapi_app.save_to_excel', return_value=True) as mock_save:
+            response = client.post(
+                "/api/submit/batch",
+                data={"data": json.dumps(batch)}
+            )
+        
+        assert response.status_code == 400
+        assert "Invalid data" in response.json()["detail"]
+        mock_save.assert_not_called()
+    
+    def test_submit_batch_empty(self, client):
+        """Test an empty batch is rejected"""
+        response = client.post(
+            "/api/submit/batch",
+            data={"data": json.dumps({"requests": []})}
+        )
+        
+        assert response.status_code == 400
+    
+    def test_submit_batch_invalid_json(self, client):
+        """Test submitting invalid JSON as a batch"""
+        response = client.post(
+            "/api/submit/batch",
+            data={"data": "invalid json"}
+        )
+        
+        assert response.status_code == 400
+        assert "Invalid JSON" in response.json()["detail"]
+
+
 class TestFileHandling:
     """Test file upload and storage functionality"""
     
@@ -210,10 +335,11 @@ class TestFileHandling:
         # File handling logic is integrated into the main endpoint
         pass
     
-    def test_file_extension_handling(self, client, sample_form_data):
+    def test_file_extension_handling(self, client, sample_form_data, mock_aiofiles_open):
         """Test proper file extension handling"""
+        mock_open_ctx, mock_file = mock_aiofiles_open
+        
         with patch('fastapi_app.save_to_excel', return_value=True), \
-             patch('builtins.open', mock_open()) as mock_file, \
              patch('os.makedirs'), \
              patch('pathlib.Path.mkdir'):
             
@@ -226,20 +352,36 @@ class TestFileHandling:
             
             assert response.status_code == 200
             # Verify file was saved with correct extension
-            mock_file.assert_called()
+            file_path = mock_open_ctx.call_args[0][0]
+            assert file_path.suffix == ".pdf"
+    
+    def test_attachment_saved_to_disk(self, client, sample_form_data, tmp_path):
+        """Test the attachment is streamed to the attachments folder unchanged"""
+        file_content = os.urandom(3 * 1024 * 1024 + 123)  # spans several chunks
+        
+        with patch('fastapi_app.save_to_excel', return_value=True), \
+             patch('fastapi_app.ATTACHMENTS_DIR', tmp_path):
+            response = client.post(
+                "/api/submit",
+                data={"data": json.dumps(sample_form_data)},
+                files={"attachment": ("scan.pdf", BytesIO(file_content), "application/pdf")}
+            )
+        
+        assert response.status_code == 200
+        request_id = response.json()["request_id"]
+        saved_file = tmp_path / f"attachment_{request_id}.pdf"
+        assert saved_file.read_bytes() == file_content
 
 
 class TestDataPersistence:
     """Test data saving to JSON/Excel"""
     
-    @patch('builtins.open', mock_open())
-    @patch('json.load', return_value=[])
-    @patch('json.dump')
-    @patch('pathlib.Path.exists', return_value=False)
-    @patch('pathlib.Path.mkdir')
-    def test_save_to_excel_new_file(self, mock_mkdir, mock_exists, mock_json_dump, mock_json_load):
+    @patch.dict('fastapi_app._append_fds', clear=True)
+    @patch('os.write')
+    @patch('os.open', return_value=99)
+    def test_save_to_excel_new_file(self, mock_os_open, mock_os_write):
         """Test saving data to new Excel/JSON file"""
-        request_id = "REQ-20251021-123456-789"
+        request_id = "REQ-1761043896123456789-3fa9"
         data = {
             "deliveryNoteNumber": "DN123",
             "carrierFullName": "Test Company"
@@ -248,36 +390,288 @@ class TestDataPersistence:
         result = save_to_excel(request_id, data, True)
         
         assert result is True
-        mock_json_dump.assert_called_once()
+        mock_os_write.assert_called_once()
+        fd, line = mock_os_write.call_args[0]
+        assert fd == 99
+        assert line.endswith(b"\n")
+        assert json.loads(line)["Request_ID"] == request_id
     
-    @patch('builtins.open', mock_open())
-    @patch('json.load', return_value=[{"Request_ID": "REQ-OLD"}])
-    @patch('json.dump')
-    @patch('pathlib.Path.exists', return_value=True)
-    def test_save_to_excel_existing_file(self, mock_exists, mock_json_dump, mock_json_load):
+    @patch.dict('fastapi_app._append_fds', clear=True)
+    @patch('os.write')
+    @patch('os.open', return_value=99)
+    def test_save_to_excel_existing_file(self, mock_os_open, mock_os_write):
         """Test appending data to existing Excel/JSON file"""
-        request_id = "REQ-20251021-123456-789"
         data = {
             "deliveryNoteNumber": "DN123",
             "carrierFullName": "Test Company"
         }
         
-        result = save_to_excel(request_id, data, False)
+        assert save_to_excel("REQ-1761043896123456789-3fa9", data, False) is True
+        assert save_to_excel("REQ-1761043897123456789-7c01", data, False) is True
         
-        assert result is True
-        # Verify that existing data was loaded and new data appended
-        mock_json_load.assert_called_once()
-        mock_json_dump.assert_called_once()
+        # The file is opened once in append mode and reused for later rows
+        mock_os_open.assert_called_once()
+        json_path, flags = mock_os_open.call_args[0][:2]
+        assert json_path.suffix == ".jsonl"
+        assert flags & os.O_APPEND
+        assert mock_os_write.call_count == 2
     
-    @patch('builtins.open', side_effect=IOError("Permission denied"))
+    @patch.dict('fastapi_app._append_fds', clear=True)
+    @patch('os.open', side_effect=IOError("Permission denied"))
     def test_save_to_excel_error_handling(self, mock_open_error):
         """Test error handling in save_to_excel"""
-        request_id = "REQ-20251021-123456-789"
+        request_id = "REQ-1761043896123456789-3fa9"
         data = {"deliveryNoteNumber": "DN123"}
         
         result = save_to_excel(request_id, data, False)
         
         assert result is False
+    
+    @patch.dict('fastapi_app._append_fds', clear=True)
+    def test_save_to_excel_round_trip(self, tmp_path):
+        """Test saved rows can be streamed back from the JSON Lines file"""
+        json_path = tmp_path / "transport_requests.jsonl"
+        data = {"deliveryNoteNumber": "DN123", "borderCrossingDate": date(2025, 10, 25)}
+        
+        try:
+            with patch('fastapi_app.REQUESTS_JSONL_PATH', json_path):
+                assert save_to_excel("REQ-1", data, True) is True
+                assert save_to_excel("REQ-2", data, False) is True
+        finally:
+            close_append_fds()
+        
+        rows = list(iter_saved_requests(json_path))
+        assert [row["Request_ID"] for row in rows] == ["REQ-1", "REQ-2"]
+        assert rows[0]["Border_Crossing_Date"] == "2025-10-25"
+        assert rows[1]["Has_Attachment"] == "No"
+    
+    def test_iter_saved_requests(self, tmp_path):
+        """Test streaming saved requests back from the JSON Lines file"""
+        json_path = tmp_path / "transport_requests.jsonl"
+        json_path.write_bytes(
+            b'{"Request_ID": "REQ-1"}\n'
+            b'\n'
+            b'{"Request_ID": "REQ-2"}\n'
+        )
+        
+        rows = list(iter_saved_requests(json_path))
+        
+        assert [row["Request_ID"] for row in rows] == ["REQ-1", "REQ-2"]
+        assert list(iter_saved_requests(tmp_path / "missing.jsonl")) == []
+    
+    def test_iter_saved_requests_skips_truncated_line(self, tmp_path):
+        """Test a partial last line (interrupted append) is skipped"""
+        json_path = tmp_path / "transport_requests.jsonl"
+        json_path.write_bytes(
+            b'{"Request_ID": "REQ-1"}\n'
+            b'{"Request_ID": "REQ-2", "Deliv'
+        )
+        
+        rows = list(iter_saved_requests(json_path))
+        
+        assert [row["Request_ID"] for row in rows] == ["REQ-1"]
+    
+    @patch.dict('fastapi_app._append_fds', clear=True)
+    def test_append_line_concurrent_first_use(self, tmp_path):
+        """Test concurrent first appends open a single descriptor and lose no lines"""
+        from concurrent.futures import ThreadPoolExecutor
+        
+        json_path = tmp_path / "transport_requests.jsonl"
+        with patch('os.open', wraps=os.open) as mock_os_open:
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                list(executor.map(lambda i: append_line(json_path, b'{"Request_ID": "REQ-%d"}\n' % i), range(64)))
+        
+        mock_os_open.assert_called_once()
+        assert len(list(iter_saved_requests(json_path))) == 64
+        
+        close_append_fds()
+        assert fastapi_app._append_fds == {}
+    
+    def test_iter_saved_requests_skips_non_objects(self, tmp_path):
+        """Test rows that are valid JSON but not objects are skipped"""
+        json_path = tmp_path / "transport_requests.jsonl"
+        json_path.write_bytes(b'[1, 2]\nnull\n{"Request_ID": "REQ-1"}\n')
+        
+        rows = list(iter_saved_requests(json_path))
+        
+        assert rows == [{"Request_ID": "REQ-1"}]
+    
+    @patch.dict('fastapi_app._append_fds', clear=True)
+    def test_save_after_truncated_line(self, tmp_path):
+        """Test a new row is not merged into a partial last line"""
+        json_path = tmp_path / "transport_requests.jsonl"
+        json_path.write_bytes(b'{"Request_ID": "REQ-1", "Deliv')
+        
+        try:
+            with patch('fastapi_app.REQUESTS_JSONL_PATH', json_path):
+                assert save_to_excel("REQ-2", {"deliveryNoteNumber": "DN2"}, False) is True
+        finally:
+            close_append_fds()
+        
+        rows = list(iter_saved_requests(json_path))
+        assert [row["Request_ID"] for row in rows] == ["REQ-2"]
+    
+    def test_migrate_legacy_json(self, tmp_path):
+        """Test rows from the old JSON array file are moved in front of the JSON Lines rows"""
+        legacy_path = tmp_path / "transport_requests.json"
+        legacy_path.write_text(json.dumps([{"Request_ID": "REQ-1"}, {"Request_ID": "REQ-2"}], indent=2))
+        json_path = tmp_path / "transport_requests.jsonl"
+        json_path.write_bytes(b'{"Request_ID": "REQ-3"}\n')
+        
+        assert migrate_legacy_json(legacy_path, json_path) == 2
+        
+        rows = list(iter_saved_requests(json_path))
+        assert [row["Request_ID"] for row in rows] == ["REQ-1", "REQ-2", "REQ-3"]
+        assert not legacy_path.exists()
+        assert (tmp_path / "transport_requests.json.migrated").exists()
+        
+        # Runs only once
+        assert migrate_legacy_json(legacy_path, json_path) == 0
+        assert len(list(iter_saved_requests(json_path))) == 3
+    
+    def test_migrate_legacy_json_invalid_file_left_alone(self, tmp_path):
+        """Test an unreadable legacy file is not touched"""
+        legacy_path = tmp_path / "transport_requests.json"
+        legacy_path.write_text('[{"Request_ID": ')
+        json_path = tmp_path / "transport_requests.jsonl"
+        
+        assert migrate_legacy_json(legacy_path, json_path) == 0
+        assert legacy_path.exists()
+        assert not json_path.exists()
+    
+    def test_export_to_excel(self, tmp_path):
+        """Test exporting saved requests to an Excel file"""
+        from openpyxl import load_workbook
+        
+        json_path = tmp_path / "transport_requests.jsonl"
+        json_path.write_bytes(
+            b'{"Request_ID": "REQ-1", "Delivery_Note_Number": "DN1", "Has_Attachment": "Yes"}\n'
+            b'{"Request_ID": "REQ-2", "Delivery_Note_Number": "DN2", "Has_Attachment": "No"}\n'
+        )
+        excel_path = tmp_path / "transport_requests.xlsx"
+        
+        rows = export_to_excel(json_path, excel_path)
+        
+        assert rows == 2
+        sheet = load_workbook(excel_path).active
+        values = list(sheet.iter_rows(values_only=True))
+        assert list(values[0]) == EXCEL_COLUMNS
+        assert values[1][0] == "REQ-1"
+        assert values[2][EXCEL_COLUMNS.index("Delivery_Note_Number")] == "DN2"
+    
+    @patch.dict('fastapi_app._saved_requests', clear=True)
+    @patch.dict('fastapi_app._append_fds', clear=True)
+    def test_get_saved_request(self, client, sample_form_data, tmp_path):
+        """Test a submitted request can be fetched back by its ID"""
+        try:
+            with patch('fastapi_app.REQUESTS_JSONL_PATH', tmp_path / "transport_requests.jsonl"):
+                response = client.post(
+                    "/api/submit",
+                    data={"data": json.dumps(sample_form_data)}
+                )
+                request_id = response.json()["request_id"]
+                
+                response = client.get(f"/api/requests/{request_id}")
+        finally:
+            close_append_fds()
+        
+        assert response.status_code == 200
+        row = response.json()
+        assert row["Request_ID"] == request_id
+        assert row["Delivery_Note_Number"] == sample_form_data["deliveryNoteNumber"]
+        assert row["Border_Crossing_Date"] == sample_form_data["borderCrossingDate"]
+    
+    @patch.dict('fastapi_app._saved_requests', clear=True)
+    def test_saved_requests_indexed_at_startup(self, tmp_path):
+        """Test requests saved by an earlier run are served after startup"""
+        json_path = tmp_path / "transport_requests.jsonl"
+        json_path.write_bytes(b'{"Request_ID": "REQ-1", "Delivery_Note_Number": "DN1"}\n')
+        
+        with patch('fastapi_app.REQUESTS_JSONL_PATH', json_path), TestClient(app) as client:
+            response = client.get("/api/requests/REQ-1")
+        
+        assert response.status_code == 200
+        assert response.json()["Delivery_Note_Number"] == "DN1"
+    
+    @patch.dict('fastapi_app._saved_requests', clear=True)
+    @patch.dict('fastapi_app._append_fds', clear=True)
+    def test_legacy_requests_served_after_startup(self, tmp_path):
+        """Test requests from the old JSON array file are migrated and served at startup"""
+        legacy_path = tmp_path / "transport_requests.json"
+        legacy_path.write_text(json.dumps([{"Request_ID": "REQ-OLD", "Delivery_Note_Number": "DN0"}]))
+        json_path = tmp_path / "transport_requests.jsonl"
+        
+        with patch('fastapi_app.LEGACY_JSON_PATH', legacy_path), \
+             patch('fastapi_app.REQUESTS_JSONL_PATH', json_path), \
+             TestClient(app) as client:
+            response = client.get("/api/requests/REQ-OLD")
+        
+        assert response.status_code == 200
+        assert response.json()["Delivery_Note_Number"] == "DN0"
+    
+    @patch.dict('fastapi_app._saved_requests', clear=True)
+    def test_startup_with_truncated_last_line(self, tmp_path):
+        """Test the app still starts and indexes valid rows when the last line is partial"""
+        json_path = tmp_path / "transport_requests.jsonl"
+        json_path.write_bytes(
+            b'{"Request_ID": "REQ-1", "Delivery_Note_Number": "DN1"}\n'
+            b'{"Request_ID": "REQ-2", "Deliv'
+        )
+        
+        with patch('fastapi_app.REQUESTS_JSONL_PATH', json_path), TestClient(app) as client:
+            assert client.get("/api/requests/REQ-1").status_code == 200
+            assert client.get("/api/requests/REQ-2").status_code == 404
+    
+    @patch.dict('fastapi_app._saved_requests', clear=True)
+    def test_startup_skips_rows_without_request_id(self, tmp_path):
+        """Test non-object rows and rows without a Request_ID do not stop startup"""
+        json_path = tmp_path / "transport_requests.jsonl"
+        json_path.write_bytes(
+            b'[1, 2, 3]\n'
+            b'"text"\n'
+            b'{"Delivery_Note_Number": "DN0"}\n'
+            b'{"Request_ID": "REQ-1", "Delivery_Note_Number": "DN1"}\n'
+        )
+        
+        with patch('fastapi_app.REQUESTS_JSONL_PATH', json_path), TestClient(app) as client:
+            assert client.get("/api/requests/REQ-1").status_code == 200
+            response = client.get("/api/export")
+        
+        assert response.status_code == 200
+    
+    @patch.dict('fastapi_app._saved_requests', clear=True)
+    def test_get_saved_request_not_found(self, client):
+        """Test looking up an unknown request ID returns 404"""
+        response = client.get("/api/requests/REQ-0-0000")
+        
+        assert response.status_code == 404
+
+
+class TestExportEndpoint:
+    """Test the Excel export endpoint"""
+    
+    def test_export_serves_temporary_workbook(self, client, tmp_path):
+        """Test each export builds its own workbook and removes it after sending"""
+        from openpyxl import load_workbook
+        
+        json_path = tmp_path / "transport_requests.jsonl"
+        json_path.write_bytes(b'{"Request_ID": "REQ-1"}\n')
+        excel_path = tmp_path / "transport_requests.xlsx"
+        
+        with patch('fastapi_app.REQUESTS_JSONL_PATH', json_path), \
+             patch('fastapi_app.EXCEL_PATH', excel_path), \
+             patch('fastapi_app.EXCEL_DIR', tmp_path):
+            first = client.get("/api/export")
+            second = client.get("/api/export")
+        
+        for response in (first, second):
+            assert response.status_code == 200
+            assert 'filename="transport_requests.xlsx"' in response.headers["content-disposition"]
+            sheet = load_workbook(BytesIO(response.content)).active
+            assert [row[0] for row in sheet.iter_rows(values_only=True)] == ["Request_ID", "REQ-1"]
+        
+        # Temporary workbooks are gone, only the source data is left
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["transport_requests.jsonl"]
 
 
 class TestRequestIDGeneration:
@@ -294,13 +688,13 @@ class TestRequestIDGeneration:
         data = response.json()
         request_id = data["request_id"]
         
-        # Format: REQ-YYYYMMDD-HHMMSS-XXX
+        # Format: REQ-<unix time in ns>-XXXX
         assert request_id.startswith("REQ-")
         parts = request_id.split("-")
-        assert len(parts) == 4
-        assert len(parts[1]) == 8  # YYYYMMDD
-        assert len(parts[2]) == 6  # HHMMSS
-        assert len(parts[3]) == 3  # XXX (random number)
+        assert len(parts) == 3
+        assert parts[1].isdigit()  # time.time_ns()
+        assert len(parts[2]) == 4  # XXXX (random hex)
+        int(parts[2], 16)
     
     def test_request_id_uniqueness(self, client, sample_form_data):
         """Test that multiple requests generate unique IDs"""
@@ -317,6 +711,16 @@ class TestRequestIDGeneration:
         
         # All IDs should be unique
         assert len(set(request_ids)) == len(request_ids)
+    
+    def test_request_id_unique_with_coarse_clock(self):
+        """Test IDs minted within one clock tick stay unique (coarse clocks, batches)"""
+        from fastapi_app import _new_request_id
+        
+        with patch('fastapi_app.time.time_ns', return_value=1761043896000000000), \
+             patch('fastapi_app.os.urandom', return_value=b"\x00\x00"):
+            request_ids = [_new_request_id() for _ in range(100)]
+        
+        assert len(set(request_ids)) == 100
 
 
 class TestErrorHandling:
@@ -327,20 +731,88 @@ class TestErrorHandling:
         response = client.post("/api/submit", data={"invalid": "data"})
         assert response.status_code == 422
     
-    def test_oversized_file(self, client, sample_form_data):
+    def test_oversized_file(self, client, sample_form_data, tmp_path):
         """Test handling of oversized files"""
         # Create a large file (this test would need actual size limits implemented)
         large_content = b"x" * (100 * 1024 * 1024)  # 100MB
         
-        response = client.post(
-            "/api/submit",
-            data={"data": json.dumps(sample_form_data)},
-            files={"attachment": ("large.pdf", BytesIO(large_content), "application/pdf")}
-        )
+        with patch('fastapi_app.save_to_excel', return_value=True), \
+             patch('fastapi_app.ATTACHMENTS_DIR', tmp_path):
+            response = client.post(
+                "/api/submit",
+                data={"data": json.dumps(sample_form_data)},
+                files={"attachment": ("large.pdf", BytesIO(large_content), "application/pdf")}
+            )
         
         # This would depend on actual file size validation implementation
         # For now, the endpoint doesn't have size limits, so this test serves as placeholder
 
 
+class TestStructuredLogger:
+    """Test structured JSON/CSV logging"""
+    
+    @pytest.fixture
+    def structured_logger(self, tmp_path):
+        structured_logger = StructuredLogger(log_dir=str(tmp_path), app_name="test_app")
+        yield structured_logger
+        structured_logger.close()
+    
+    def test_form_submit_written_immediately(self, structured_logger, tmp_path, sample_form_data):
+        """Test entries are written directly when the background writer is not running"""
+        structured_logger.log_form_submit(sample_form_data, request_id="REQ-1")
+        structured_logger.close()
+        
+        jsonl_lines = next(tmp_path.glob("test_app_*.jsonl")).read_bytes().splitlines()
+        assert json.loads(jsonl_lines[0])["request_id"] == "REQ-1"
+        csv_lines = next(tmp_path.glob("form_submissions_*.csv")).read_text().splitlines()
+        assert len(csv_lines) == 2  # header + row
+        assert '"REQ-1"' in csv_lines[1]
+    
+    def test_background_writer_batches_entries(self, structured_logger, tmp_path, sample_form_data):
+        """Test queued entries are all written when the background writer stops"""
+        async def submit_many():
+            structured_logger.start()
+            for i in range(100):
+                structured_logger.log_form_submit(sample_form_data, request_id=f"REQ-{i}")
+            structured_logger.log_info("done")
+            await structured_logger.stop()
+        
+        with patch.object(structured_logger, "_write_batch", wraps=structured_logger._write_batch) as mock_write:
+            asyncio.run(submit_many())
+        
+        # 101 entries need at least two batches of LOG_BATCH_SIZE, but far fewer than 101 writes
+        assert 2 <= mock_write.call_count < 101
+        structured_logger.close()
+        jsonl_lines = next(tmp_path.glob("test_app_*.jsonl")).read_bytes().splitlines()
+        assert len(jsonl_lines) == 101
+        assert json.loads(jsonl_lines[-1])["message"] == "done"
+    
+    def test_background_writer_survives_write_error(self, structured_logger, tmp_path):
+        """Test a failing batch write does not stop later entries from being written"""
+        write_batch = structured_logger._write_batch
+        calls = []
+        
+        def failing_once(entries):
+            calls.append(entries)
+            if len(calls) == 1:
+                raise OSError(28, "No space left on device")
+            write_batch(entries)
+        
+        async def log_around_failure():
+            structured_logger.start()
+            structured_logger.log_info("lost")
+            await asyncio.sleep(0.05)  # let the first batch fail
+            structured_logger.log_info("kept")
+            await structured_logger.stop()
+        
+        with patch.object(structured_logger, "_write_batch", side_effect=failing_once):
+            asyncio.run(log_around_failure())
+        
+        assert len(calls) == 2
+        structured_logger.close()
+        jsonl_lines = next(tmp_path.glob("test_app_*.jsonl")).read_bytes().splitlines()
+        assert [json.loads(line)["message"] for line in jsonl_lines] == ["kept"]
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
\ No newline at end of file
@@ -0,0 +1,31 @@
+"""
+Shared pytest configuration for the repository-level test suites
+"""
+
+import pytest
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--thorough",
+        action="store_true",
+        default=False,
+        help="also run client-side concurrency tests (one HTTP request per submission)"
+    )
+
+
+def pytest_configure(config):
+    # pytest.ini is not picked up as pytest configuration, so the markers
+    # used by test_integration.py are registered here
+    config.addinivalue_line("markers", "slow: Slow running tests (nightly)")
+    config.addinivalue_line("markers", "perf: Performance tests")
+    config.addinivalue_line("markers", "thorough: Tests that only run with --thorough")
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--thorough"):
+        return
+    skip_thorough = pytest.mark.skip(reason="needs --thorough to run")
+    for item in items:
+        if "thorough" in item.keywords:
+            item.add_marker(skip_thorough)
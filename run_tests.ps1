@@ -1,9 +1,9 @@
 # Test runner script for Transport Request Application (Windows PowerShell)
-# Usage: .\run_tests.ps1 [backend|frontend|integration|all]
+# Usage: .\run_tests.ps1 [backend|frontend|integration|slow|all]
 
 param(
     [Parameter(Position=0)]
-    [ValidateSet("backend", "frontend", "integration", "all", "help")]
+    [ValidateSet("backend", "frontend", "integration", "slow", "all", "help")]
     [string]$Command = "all"
 )
 
@@ -123,8 +123,10 @@ function Invoke-FrontendTests {
 }
 
 # Function to run integration tests
+# $Markers: marker expression selecting the tests (default: everything but slow tests)
 function Invoke-IntegrationTests {
-    Write-Status "Running Integration Tests..."
+    param([string]$Markers = "not slow")
+    Write-Status "Running Integration Tests (-m `"$Markers`")..."
     
     # Check if backend is running
     Write-Status "Checking if backend is running..."
@@ -174,7 +176,7 @@ function Invoke-IntegrationTests {
     
     # Run integration tests
     Write-Status "Executing integration tests..."
-    pytest test_integration.py -v
+    pytest test_integration.py -v -n auto --dist load -m $Markers
     
     $testResult = ($LASTEXITCODE -eq 0)
     
@@ -237,12 +239,13 @@ function Invoke-AllTests {
 
 # Function to show usage
 function Show-Usage {
-    Write-Host "Usage: .\run_tests.ps1 [backend|frontend|integration|all]"
+    Write-Host "Usage: .\run_tests.ps1 [backend|frontend|integration|slow|all]"
     Write-Host ""
     Write-Host "Commands:"
     Write-Host "  backend      Run backend unit tests only"
     Write-Host "  frontend     Run frontend component tests only"
-    Write-Host "  integration  Run integration tests only"
+    Write-Host "  integration  Run integration tests only (skips slow/perf tests)"
+    Write-Host "  slow         Run slow and performance integration tests (nightly)"
     Write-Host "  all          Run all tests (default)"
     Write-Host ""
     Write-Host "Examples:"
@@ -263,6 +266,9 @@ try {
         "integration" {
             $result = Invoke-IntegrationTests
         }
+        "slow" {
+            $result = Invoke-IntegrationTests -Markers "slow"
+        }
         "all" {
             $result = Invoke-AllTests
         }
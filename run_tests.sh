@@ -1,6 +1,6 @@
 #!/bin/bash
 # Test runner script for Transport Request Application
-# Usage: ./run_tests.sh [backend|frontend|integration|all]
+# Usage: ./run_tests.sh [backend|frontend|integration|slow|all]
 
 set -e  # Exit on any error
 
@@ -119,8 +119,10 @@ run_frontend_tests() {
 }
 
 # Function to run integration tests
+# $1: marker expression selecting the tests (default: everything but slow tests)
 run_integration_tests() {
-    print_status "Running Integration Tests..."
+    local markers="${1:-not slow}"
+    print_status "Running Integration Tests (-m \"$markers\")..."
     
     # Check if backend is running
     print_status "Checking if backend is running..."
@@ -160,7 +162,7 @@ run_integration_tests() {
     
     # Run integration tests
     print_status "Executing integration tests..."
-    if pytest test_integration.py -v; then
+    if pytest test_integration.py -v -n auto --dist load -m "$markers"; then
         print_success "Integration tests passed!"
         
         # Clean up background process if we started it
@@ -235,12 +237,13 @@ run_all_tests() {
 
 # Function to show usage
 show_usage() {
-    echo "Usage: $0 [backend|frontend|integration|all]"
+    echo "Usage: $0 [backend|frontend|integration|slow|all]"
     echo
     echo "Commands:"
     echo "  backend      Run backend unit tests only"
     echo "  frontend     Run frontend component tests only"
-    echo "  integration  Run integration tests only"
+    echo "  integration  Run integration tests only (skips slow/perf tests)"
+    echo "  slow         Run slow and performance integration tests (nightly)"
     echo "  all          Run all tests (default)"
     echo
     echo "Examples:"
@@ -260,6 +263,9 @@ case "${1:-all}" in
     "integration")
         run_integration_tests
         ;;
+    "slow")
+        run_integration_tests "slow"
+        ;;
     "all")
         run_all_tests
         ;;
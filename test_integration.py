@@ -8,56 +8,154 @@ These tests verify the entire flow from frontend to backend including:
 - API endpoints integration
 
 Run with:
-    pytest test_integration.py -v
+    pytest test_integration.py -v -m "not slow"
+
+slow and perf tests (performance checks, docker-compose CLI) run on demand:
+    pytest test_integration.py -m slow
+
+add --thorough to also fire concurrent submissions from separate clients
+instead of a single batch call:
+    pytest test_integration.py -m slow --thorough
+
+or spread across CPU cores with pytest-xdist:
+    pytest test_integration.py -n auto --dist load
 """
 
 import pytest
 import requests
-import json
+import httpx
+from requests.adapters import HTTPAdapter
 import time
 import subprocess
 import os
+import sys
+import asyncio
+import functools
+import tomllib
 from pathlib import Path
 
+orjson = pytest.importorskip("orjson")
+
+# Fail fast when the backend does not accept connections, but give the
+# request itself time to complete: (connect, read) in seconds
+HTTP_TIMEOUT = (1, 5)
+
+# BLAKE3 when installed, SHA-256 otherwise
+try:
+    from blake3 import blake3 as _hash
+except ImportError:
+    from hashlib import sha256 as _hash
+
+BACKEND_URL = "http://localhost:8000"
+
+
+@functools.lru_cache(maxsize=None)
+def _read_text(path: str) -> str:
+    """Read a repository file once per session"""
+    return Path(path).read_text(encoding="utf-8")
+
+
+@pytest.fixture(scope="session")
+def backend_config():
+    """backend/config.toml parsed once per session"""
+    config_path = Path("backend/config.toml")
+    assert config_path.exists()
+    return tomllib.loads(_read_text(str(config_path)))
+
+
+@pytest.fixture(scope="session")
+def worker_suffix(request):
+    """Suffix that keeps delivery note numbers unique per xdist worker"""
+    workerinput = getattr(request.config, "workerinput", None)
+    if workerinput is None:
+        return ""
+    return f"-{workerinput['workerid']}"
+
+
+def _digest(data: bytes) -> bytes:
+    """Content digest used to compare uploads with the files saved by the backend"""
+    return _hash(data).digest()
+
+
+@pytest.fixture(scope="session", params=[1 << 10, 1 << 20, 10 << 20], ids=["1KB", "1MB", "10MB"])
+def pdf_payload(request):
+    """Synthetic PDF upload and its digest, built once per size for the whole session"""
+    header = b"%PDF-1.4\n% Integration test document\n"
+    payload = header + bytes(request.param - len(header))
+    return payload, _digest(payload)
+
+
+@functools.lru_cache(maxsize=None)
+def _probe_backend() -> bool:
+    """Check once per session whether the backend answers at all"""
+    try:
+        requests.get(f"{BACKEND_URL}/", timeout=1)
+    except requests.RequestException:
+        return False
+    return True
+
+
+requires_backend = pytest.mark.skipif(
+    not _probe_backend(),
+    reason="Backend not running - start with: python backend/fastapi_app.py"
+)
+
+
+@pytest.fixture(scope="session")
+def backend_url():
+    """Backend URL for testing"""
+    return BACKEND_URL
+
+
+@pytest.fixture(scope="session")
+def frontend_url():
+    """Frontend URL for testing"""
+    return "http://localhost:3000"
+
+
+@pytest.fixture(scope="session")
+def api_client():
+    """FastAPI app served in-process through TestClient, loaded once per session"""
+    pytest.importorskip("fastapi")
+    sys.path.insert(0, str(Path(__file__).parent / "backend"))
+    fastapi_app = pytest.importorskip("fastapi_app")
+    from fastapi.testclient import TestClient
+    return TestClient(fastapi_app.app)
+
+
+@pytest.fixture(scope="session")
+def http():
+    """Keep-alive HTTP session shared by every test"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16)
+    session.mount("http://", adapter)
+    yield session
+    session.close()
 
+
+@requires_backend
 class TestSystemIntegration:
     """Test the complete system integration"""
     
-    @pytest.fixture(scope="class")
-    def backend_url(self):
-        """Backend URL for testing"""
-        return "http://localhost:8000"
-    
-    @pytest.fixture(scope="class")
-    def frontend_url(self):
-        """Frontend URL for testing"""
-        return "http://localhost:3000"
-    
-    def test_backend_health_check(self, backend_url):
+    def test_backend_health_check(self, http, backend_url):
         """Test that backend is running and healthy"""
-        try:
-            response = requests.get(f"{backend_url}/", timeout=5)
-            assert response.status_code == 200
-            data = response.json()
-            assert data["status"] == "healthy"
-            assert data["message"] == "Transport backend running"
-        except requests.ConnectionError:
-            pytest.skip("Backend not running - start with: python backend/fastapi_app.py")
+        response = http.get(f"{backend_url}/", timeout=HTTP_TIMEOUT)
+        assert response.status_code == 200
+        data = response.json()
+        assert data["status"] == "healthy"
+        assert data["message"] == "Transport backend running"
     
-    def test_api_health_endpoint(self, backend_url):
+    def test_api_health_endpoint(self, http, backend_url):
         """Test API health endpoint"""
-        try:
-            response = requests.get(f"{backend_url}/api/health", timeout=5)
-            assert response.status_code == 200
-            data = response.json()
-            assert data["status"] == "healthy"
-        except requests.ConnectionError:
-            pytest.skip("Backend not running")
+        response = http.get(f"{backend_url}/api/health", timeout=HTTP_TIMEOUT)
+        assert response.status_code == 200
+        data = response.json()
+        assert data["status"] == "healthy"
     
-    def test_submit_form_data_only(self, backend_url):
+    def test_submit_form_data_only(self, http, backend_url, worker_suffix):
         """Test submitting form data without file attachment"""
         form_data = {
-            "deliveryNoteNumber": "INT-TEST-001",
+            "deliveryNoteNumber": f"INT-TEST-001{worker_suffix}",
             "truckLicensePlates": "IT123AB",
             "trailerLicensePlates": "IT456CD",
             "carrierCountry": "Italy",
@@ -67,28 +165,24 @@ class TestSystemIntegration:
             "borderCrossingDate": "2025-10-30"
         }
         
-        try:
-            response = requests.post(
-                f"{backend_url}/api/submit",
-                data={"data": json.dumps(form_data)},
-                timeout=10
-            )
-            
-            assert response.status_code == 200
-            data = response.json()
-            assert data["success"] is True
-            assert "request_id" in data
-            assert data["request_id"].startswith("REQ-")
-            assert data["attachment_saved"] is False
-            assert data["excel_saved"] is True
-            
-        except requests.ConnectionError:
-            pytest.skip("Backend not running")
+        response = http.post(
+            f"{backend_url}/api/submit",
+            data={"data": orjson.dumps(form_data).decode()},
+            timeout=HTTP_TIMEOUT
+        )
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["success"] is True
+        assert "request_id" in data
+        assert data["request_id"].startswith("REQ-")
+        assert data["attachment_saved"] is False
+        assert data["excel_saved"] is True
     
-    def test_submit_form_with_file(self, backend_url):
+    def test_submit_form_with_file(self, http, backend_url, worker_suffix, pdf_payload):
         """Test submitting form data with file attachment"""
         form_data = {
-            "deliveryNoteNumber": "INT-TEST-002",
+            "deliveryNoteNumber": f"INT-TEST-002{worker_suffix}",
             "truckLicensePlates": "DE789XY",
             "trailerLicensePlates": "DE012ZW",
             "carrierCountry": "Germany",
@@ -98,77 +192,37 @@ class TestSystemIntegration:
             "borderCrossingDate": "2025-10-31"
         }
         
-        # Create a test file
-        test_file_content = b"Integration test PDF content - this is a test document for file upload."
+        test_file_content, expected_digest = pdf_payload
+        
+        response = http.post(
+            f"{backend_url}/api/submit",
+            data={"data": orjson.dumps(form_data).decode()},
+            files={"attachment": ("integration_test.pdf", test_file_content, "application/pdf")},
+            timeout=HTTP_TIMEOUT
+        )
         
+        assert response.status_code == 200
+        data = response.json()
+        assert data["success"] is True
+        assert data["attachment_saved"] is True
+        assert data["excel_saved"] is True
+        
+        # Verify file was saved
+        request_id = data["request_id"]
+        expected_file_path = Path("backend/attachments") / f"attachment_{request_id}.pdf"
         try:
-            response = requests.post(
-                f"{backend_url}/api/submit",
-                data={"data": json.dumps(form_data)},
-                files={"attachment": ("integration_test.pdf", test_file_content, "application/pdf")},
-                timeout=10
-            )
-            
-            assert response.status_code == 200
-            data = response.json()
-            assert data["success"] is True
-            assert data["attachment_saved"] is True
-            assert data["excel_saved"] is True
-            
-            # Verify file was saved
-            request_id = data["request_id"]
-            expected_file_path = Path("backend/attachments") / f"{request_id}_integration_test.pdf"
             assert expected_file_path.exists()
             
             # Verify file content
-            with open(expected_file_path, 'rb') as f:
-                saved_content = f.read()
-                assert saved_content == test_file_content
-                
-        except requests.ConnectionError:
-            pytest.skip("Backend not running")
+            assert _digest(expected_file_path.read_bytes()) == expected_digest
+        finally:
+            # Up to 10 MiB per run, don't leave it behind
+            expected_file_path.unlink(missing_ok=True)
     
-    def test_invalid_form_data(self, backend_url):
-        """Test handling of invalid form data"""
-        invalid_data = {
-            "deliveryNoteNumber": "",  # Empty required field
-            "invalidField": "should not be accepted"
-        }
-        
-        try:
-            response = requests.post(
-                f"{backend_url}/api/submit",
-                data={"data": json.dumps(invalid_data)},
-                timeout=5
-            )
-            
-            assert response.status_code == 400
-            data = response.json()
-            assert "Invalid data" in data["detail"]
-            
-        except requests.ConnectionError:
-            pytest.skip("Backend not running")
-    
-    def test_malformed_json(self, backend_url):
-        """Test handling of malformed JSON"""
-        try:
-            response = requests.post(
-                f"{backend_url}/api/submit",
-                data={"data": "invalid json"},
-                timeout=5
-            )
-            
-            assert response.status_code == 400
-            data = response.json()
-            assert "Invalid JSON" in data["detail"]
-            
-        except requests.ConnectionError:
-            pytest.skip("Backend not running")
-    
-    def test_data_persistence(self, backend_url):
+    def test_data_persistence(self, http, backend_url, worker_suffix):
         """Test that submitted data is properly saved"""
         form_data = {
-            "deliveryNoteNumber": "PERSIST-TEST-001",
+            "deliveryNoteNumber": f"PERSIST-TEST-001{worker_suffix}",
             "truckLicensePlates": "PS123TE",
             "trailerLicensePlates": "PS456ST",
             "carrierCountry": "Poland",
@@ -178,48 +232,99 @@ class TestSystemIntegration:
             "borderCrossingDate": "2025-11-01"
         }
         
-        try:
-            response = requests.post(
-                f"{backend_url}/api/submit",
-                data={"data": json.dumps(form_data)},
-                timeout=10
-            )
-            
-            assert response.status_code == 200
-            data = response.json()
-            request_id = data["request_id"]
-            
-            # Check if data file exists and contains our data
-            data_file_path = Path("backend/data/transport_requests.json")
-            assert data_file_path.exists()
-            
-            with open(data_file_path, 'r', encoding='utf-8') as f:
-                saved_data = json.load(f)
-                
-            # Find our submitted request
-            our_request = None
-            for request in saved_data:
-                if request.get("Request_ID") == request_id:
-                    our_request = request
-                    break
-            
-            assert our_request is not None
-            assert our_request["Delivery_Note_Number"] == "PERSIST-TEST-001"
-            assert our_request["Carrier_Full_Name"] == "Persistence Test Transport"
-            
-        except requests.ConnectionError:
-            pytest.skip("Backend not running")
+        response = http.post(
+            f"{backend_url}/api/submit",
+            data={"data": orjson.dumps(form_data).decode()},
+            timeout=HTTP_TIMEOUT
+        )
+        
+        assert response.status_code == 200
+        data = response.json()
+        request_id = data["request_id"]
+        
+        # Look the saved record up by ID instead of scanning the data file
+        response = http.get(f"{backend_url}/api/requests/{request_id}", timeout=HTTP_TIMEOUT)
+        assert response.status_code == 200
+        our_request = response.json()
+        
+        assert our_request["Delivery_Note_Number"] == f"PERSIST-TEST-001{worker_suffix}"
+        assert our_request["Carrier_Full_Name"] == "Persistence Test Transport"
+
+
+class TestApiContract:
+    """Test request/response contract of the API in-process (no server needed)"""
+    
+    def test_invalid_form_data(self, api_client):
+        """Test handling of invalid form data"""
+        invalid_data = {
+            "deliveryNoteNumber": "",  # Empty required field
+            "invalidField": "should not be accepted"
+        }
+        
+        response = api_client.post(
+            "/api/submit",
+            data={"data": orjson.dumps(invalid_data).decode()}
+        )
+        
+        assert response.status_code == 400
+        data = response.json()
+        assert "Invalid data" in data["detail"]
+    
+    def test_malformed_json(self, api_client):
+        """Test handling of malformed JSON"""
+        response = api_client.post(
+            "/api/submit",
+            data={"data": "invalid json"}
+        )
+        
+        assert response.status_code == 400
+        data = response.json()
+        assert "Invalid JSON" in data["detail"]
 
 
 class TestDockerIntegration:
     """Test Docker containerization"""
     
-    def test_docker_compose_config_valid(self):
-        """Test that docker-compose.yaml is valid"""
+    @pytest.fixture(scope="session")
+    def compose_config(self):
+        """docker-compose.yaml parsed once per session"""
+        yaml = pytest.importorskip("yaml")
         docker_compose_path = Path("docker-compose.yaml")
         assert docker_compose_path.exists()
+        return yaml.safe_load(_read_text(str(docker_compose_path)))
+    
+    def test_docker_compose_config_valid(self, compose_config):
+        """Test that docker-compose.yaml defines the expected services"""
+        services = compose_config["services"]
+        assert {"nginx", "backend", "frontend"} <= set(services)
+        assert "app-network" in compose_config["networks"]
+        
+        # Only nginx is published; backend and frontend sit behind it
+        assert "8000:80" in services["nginx"]["ports"]
+        assert "ports" not in services["backend"]
+        assert "ports" not in services["frontend"]
+        
+        for name in ("backend", "frontend"):
+            build = services[name]["build"]
+            assert (Path(build["context"]) / build["dockerfile"]).exists()
+    
+    @pytest.mark.slow
+    def test_docker_compose_cli_config(self):
+        """Test that docker-compose itself accepts the file (nightly only)"""
+        try:
+            import compose.config
+            from compose.config.environment import Environment
+        except ImportError:
+            compose = None
+        
+        if compose is not None:
+            # docker-compose v1 is a Python package: validate in-process
+            # instead of paying for a second interpreter start-up
+            environment = Environment.from_env_file(".")
+            details = compose.config.find(".", ["docker-compose.yaml"], environment)
+            compose.config.load(details)
+            return
         
-        # Try to validate docker-compose file
         try:
             result = subprocess.run(
                 ["docker-compose", "config"],
@@ -239,51 +344,38 @@ class TestDockerIntegration:
         dockerfile_path = Path("backend/Dockerfile")
         assert dockerfile_path.exists()
         
-        with open(dockerfile_path, 'r') as f:
-            content = f.read()
-            assert "FROM python:" in content
-            assert "COPY requirements.txt" in content
-            assert "pip install" in content
-            assert "CMD" in content or "ENTRYPOINT" in content
+        content = _read_text(str(dockerfile_path))
+        assert "FROM python:" in content
+        assert "COPY requirements.txt" in content
+        assert "pip install" in content
+        assert "CMD" in content or "ENTRYPOINT" in content
     
     def test_frontend_dockerfile_exists(self):
         """Test frontend Dockerfile exists and is valid"""
         dockerfile_path = Path("frontend/Dockerfile")
         assert dockerfile_path.exists()
         
-        with open(dockerfile_path, 'r') as f:
-            content = f.read()
-            assert "FROM node:" in content
-            assert "package.json" in content
-            assert "npm" in content
+        content = _read_text(str(dockerfile_path))
+        assert "FROM node:" in content
+        assert "package.json" in content
+        assert "npm" in content
 
 
 class TestConfigurationIntegration:
     """Test configuration system integration"""
     
-    def test_config_file_exists(self):
-        """Test that config.yaml exists and is valid"""
-        config_path = Path("backend/config.yaml")
-        assert config_path.exists()
+    def test_config_file_exists(self, backend_config):
+        """Test that config.toml exists and is valid"""
+        config = backend_config
         
-        import yaml
-        with open(config_path, 'r', encoding='utf-8') as f:
-            config = yaml.safe_load(f)
-            
         assert "default" in config
         assert "transport" in config["default"]
         assert "local_attachments_folder" in config["default"]["transport"]
         assert "local_excel_file" in config["default"]["transport"]
     
-    def test_attachment_directory_creation(self):
+    def test_attachment_directory_creation(self, backend_config):
         """Test that attachment directory is created when needed"""
-        import yaml
-        
-        config_path = Path("backend/config.yaml")
-        with open(config_path, 'r', encoding='utf-8') as f:
-            config = yaml.safe_load(f)
-            
-        attachments_folder = config["default"]["transport"]["local_attachments_folder"]
+        attachments_folder = backend_config["default"]["transport"]["local_attachments_folder"]
         attachments_path = Path("backend") / attachments_folder
         
         # Directory should exist or be creatable
@@ -294,13 +386,16 @@ class TestConfigurationIntegration:
         assert attachments_path.is_dir()
 
 
+@requires_backend
+@pytest.mark.slow
+@pytest.mark.perf
 class TestPerformanceIntegration:
     """Test system performance characteristics"""
     
-    def test_api_response_time(self, backend_url="http://localhost:8000"):
+    def test_api_response_time(self, http, backend_url, worker_suffix):
         """Test API response time is reasonable"""
         form_data = {
-            "deliveryNoteNumber": "PERF-TEST-001",
+            "deliveryNoteNumber": f"PERF-TEST-001{worker_suffix}",
             "truckLicensePlates": "PF123RM",
             "trailerLicensePlates": "PF456NC",
             "carrierCountry": "France",
@@ -310,75 +405,86 @@ class TestPerformanceIntegration:
             "borderCrossingDate": "2025-11-05"
         }
         
-        try:
-            start_time = time.time()
-            response = requests.post(
-                f"{backend_url}/api/submit",
-                data={"data": json.dumps(form_data)},
-                timeout=10
-            )
-            end_time = time.time()
-            
-            response_time = end_time - start_time
-            assert response.status_code == 200
-            assert response_time < 5.0  # Should respond within 5 seconds
-            
-        except requests.ConnectionError:
-            pytest.skip("Backend not running")
+        start_time = time.time()
+        response = http.post(
+            f"{backend_url}/api/submit",
+            data={"data": orjson.dumps(form_data).decode()},
+            timeout=HTTP_TIMEOUT
+        )
+        end_time = time.time()
+        
+        response_time = end_time - start_time
+        assert response.status_code == 200
+        assert response_time < 5.0  # Should respond within 5 seconds
+    
+    @staticmethod
+    def concurrent_form_data(n_concurrent, request_id, worker_suffix):
+        """Form data for one of n_concurrent simultaneous submissions"""
+        return {
+            "deliveryNoteNumber": f"CONCURRENT-{n_concurrent}-{request_id}{worker_suffix}",
+            "truckLicensePlates": f"C{request_id:02d}123",
+            "trailerLicensePlates": f"C{request_id:02d}456",
+            "carrierCountry": "Spain",
+            "carrierTaxCode": "ES12345678901",
+            "carrierFullName": f"Concurrent Test {request_id}",
+            "borderCrossing": "Nadlac",
+            "borderCrossingDate": "2025-11-10"
+        }
     
-    def test_concurrent_requests(self, backend_url="http://localhost:8000"):
-        """Test handling of multiple concurrent requests"""
-        import threading
-        import queue
+    @pytest.mark.parametrize("n_concurrent", [5, 25, 100])
+    def test_concurrent_requests(self, http, backend_url, worker_suffix, n_concurrent):
+        """Test the backend stores a batch of requests concurrently"""
+        batch = {
+            "requests": [
+                self.concurrent_form_data(n_concurrent, i, worker_suffix)
+                for i in range(n_concurrent)
+            ]
+        }
         
-        results = queue.Queue()
+        response = http.post(
+            f"{backend_url}/api/submit/batch",
+            data={"data": orjson.dumps(batch).decode()},
+            timeout=(HTTP_TIMEOUT[0], 30)
+        )
         
-        def make_request(request_id):
-            form_data = {
-                "deliveryNoteNumber": f"CONCURRENT-{request_id}",
-                "truckLicensePlates": f"C{request_id:02d}123",
-                "trailerLicensePlates": f"C{request_id:02d}456",
-                "carrierCountry": "Spain",
-                "carrierTaxCode": "ES12345678901",
-                "carrierFullName": f"Concurrent Test {request_id}",
-                "borderCrossing": "Nadlac",
-                "borderCrossingDate": "2025-11-10"
-            }
+        assert response.status_code == 200
+        data = response.json()
+        assert data["success"] is True
+        assert data["count"] == n_concurrent
+        assert all(result["success"] and result["excel_saved"] for result in data["results"])
+        assert len({result["request_id"] for result in data["results"]}) == n_concurrent
+    
+    @pytest.mark.thorough
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("n_concurrent", [5, 25, 100])
+    async def test_concurrent_client_requests(self, backend_url, worker_suffix, n_concurrent):
+        """Test handling of multiple concurrent requests from separate clients (--thorough)"""
+        async def make_request(client, request_id):
+            form_data = self.concurrent_form_data(n_concurrent, request_id, worker_suffix)
             
             try:
-                response = requests.post(
+                response = await client.post(
                     f"{backend_url}/api/submit",
-                    data={"data": json.dumps(form_data)},
-                    timeout=10
+                    data={"data": orjson.dumps(form_data).decode()},
+                    timeout=httpx.Timeout(HTTP_TIMEOUT[1], connect=HTTP_TIMEOUT[0])
                 )
-                results.put((request_id, response.status_code, response.json()))
+                return request_id, response.status_code, response.json()
             except Exception as e:
-                results.put((request_id, None, str(e)))
+                return request_id, None, str(e)
         
-        try:
-            # Create 5 concurrent requests
-            threads = []
-            for i in range(5):
-                thread = threading.Thread(target=make_request, args=(i,))
-                threads.append(thread)
-                thread.start()
-            
-            # Wait for all threads to complete
-            for thread in threads:
-                thread.join(timeout=15)
-            
-            # Check results
-            successful_requests = 0
-            while not results.empty():
-                request_id, status_code, response_data = results.get()
-                if status_code == 200:
-                    successful_requests += 1
-                    assert response_data.get("success") is True
-            
-            assert successful_requests >= 3  # At least 3 out of 5 should succeed
-            
-        except requests.ConnectionError:
-            pytest.skip("Backend not running")
+        limits = httpx.Limits(max_keepalive_connections=32)
+        async with httpx.AsyncClient(limits=limits) as client:
+            results = await asyncio.gather(*[make_request(client, i) for i in range(n_concurrent)])
+        
+        # Check results
+        successful_requests = 0
+        for request_id, status_code, response_data in results:
+            if status_code == 200:
+                successful_requests += 1
+                assert response_data.get("success") is True
+        
+        # At least 60% of the requests should succeed
+        assert successful_requests >= n_concurrent * 3 // 5
 
 
 if __name__ == "__main__":